@@ -21,6 +21,7 @@ NAME_AQUARIUS_URL = "aquarius.url"
 NAME_PROVIDER_ADDRESS = "provider.address"
 NAME_OPERATOR_SERVICE_URL = "operator_service.url"
 NAME_ALLOW_NON_PUBLIC_IP = "allow_non_public_ip"
+NAME_SAFE_HOSTS = "safe_hosts"
 NAME_STORAGE_PATH = "storage.path"
 NAME_BLOCK_CONFIRMATIONS = "block_confirmations"
 NAME_REQUESTS_TIMEOUT = "requests_timeout"
@@ -58,6 +59,11 @@ environ_names = {
         "Allow non public ip",
         "resources",
     ],
+    NAME_SAFE_HOSTS: [
+        "SAFE_HOSTS",
+        "Comma separated hosts trusted without dns checks",
+        "resources",
+    ],
     NAME_STORAGE_PATH: ["STORAGE_PATH", "Path to the local database file", "resources"],
     NAME_BLOCK_CONFIRMATIONS: [
         "BLOCK_CONFIRMATIONS",
@@ -112,6 +118,7 @@ class Config(configparser.ConfigParser):
             self.read_dict(options_dict)
 
         self._load_environ()
+        self._safe_hosts = self._parse_safe_hosts()
 
     def _load_environ(self):
         for option_name, environ_item in environ_names.items():
@@ -148,7 +155,18 @@ class Config(configparser.ConfigParser):
 
     @property
     def allow_non_public_ip(self):
-        return self.get("resources", NAME_ALLOW_NON_PUBLIC_IP, fallback=None)
+        return self.getboolean("resources", NAME_ALLOW_NON_PUBLIC_IP, fallback=False)
+
+    @property
+    def safe_hosts(self):
+        """Hosts (host[:port]) exempt from the non public ip validation of urls."""
+        return self._safe_hosts
+
+    def _parse_safe_hosts(self):
+        value = self.get("resources", NAME_SAFE_HOSTS, fallback="")
+        return frozenset(
+            host.strip().lower() for host in value.split(",") if host.strip()
+        )
 
     @property
     def auth_token_message(self):
@@ -176,4 +194,4 @@ class Config(configparser.ConfigParser):
 
     @property
     def requests_chunk_size(self):
-        return int(self.get("eth-network", NAME_REQUESTS_CHUNK_SIZE, fallback=8192))
+        return int(self.get("eth-network", NAME_REQUESTS_CHUNK_SIZE, fallback=65536))
@@ -4,16 +4,20 @@
 #
 import json
 import logging
+from urllib.parse import urlencode
 
 from flask import Response, jsonify, request
 from flask_sieve import validate
-from requests.models import PreparedRequest
-from ocean_lib.common.http_requests.requests_session import get_requests_session
 from ocean_provider.exceptions import InvalidSignatureError
 from ocean_provider.log import setup_logging
-from ocean_provider.user_nonce import get_nonce, increment_nonce
-from ocean_provider.utils.accounts import sign_message, verify_signature
-from ocean_provider.utils.basics import LocalFileAdapter, get_provider_wallet, get_web3
+from ocean_provider.user_nonce import get_and_increment_nonce, increment_nonce
+from ocean_provider.utils.accounts import sign_message_cached, verify_signature
+from ocean_provider.utils.basics import (
+    get_config,
+    get_provider_wallet,
+    get_requests_session,
+    get_web3,
+)
 from ocean_provider.utils.util import (
     build_download_response,
     get_compute_endpoint,
@@ -35,12 +39,13 @@ from . import services
 
 setup_logging()
 provider_wallet = get_provider_wallet()
-requests_session = get_requests_session()
-requests_session.mount("file://", LocalFileAdapter())
+requests_session = get_requests_session(allow_local_files=True, with_retries=True)
+compute_endpoint = get_compute_endpoint()
+compute_result_endpoint = get_compute_result_endpoint()
 
 logger = logging.getLogger(__name__)
 
-standard_headers = {"Content-type": "application/json", "Connection": "close"}
+standard_headers = {"Content-type": "application/json"}
 
 
 @services.route("/compute", methods=["DELETE"])
@@ -87,13 +92,14 @@ def computeDelete():
     try:
         body = process_compute_request(data)
         response = requests_session.delete(
-            get_compute_endpoint(),
+            compute_endpoint,
             params=body,
             headers=standard_headers,
+            stream=True,
         )
         increment_nonce(body["owner"])
         return Response(
-            response.content,
+            response.iter_content(chunk_size=get_config().requests_chunk_size),
             response.status_code,
             headers=standard_headers,
         )
@@ -149,13 +155,14 @@ def computeStop():
     try:
         body = process_compute_request(data)
         response = requests_session.put(
-            get_compute_endpoint(),
+            compute_endpoint,
             params=body,
             headers=standard_headers,
+            stream=True,
         )
         increment_nonce(body["owner"])
         return Response(
-            response.content,
+            response.iter_content(chunk_size=get_config().requests_chunk_size),
             response.status_code,
             headers=standard_headers,
         )
@@ -213,7 +220,7 @@ def computeStatus():
         body = process_compute_request(data)
 
         response = requests_session.get(
-            get_compute_endpoint(),
+            compute_endpoint,
             params=body,
             headers=standard_headers,
         )
@@ -227,20 +234,17 @@ def computeStatus():
             did = data.get("documentId")
             jobId = data.get("jobId")
             original_msg = f"{owner}{jobId}{did}"
+            nonce = get_and_increment_nonce(owner)
             try:
-                verify_signature(
-                    owner, data.get("signature"), original_msg, get_nonce(owner)
-                )
+                verify_signature(owner, data.get("signature"), original_msg, nonce)
             except InvalidSignatureError:
                 signed_request = False
-            increment_nonce(owner)
 
         # Filter status info if signature is not given or failed validation
         if not signed_request:
-            resp_content = json.loads(response.content.decode("utf-8"))
+            resp_content = json.loads(response.content)
             if not isinstance(resp_content, list):
                 resp_content = [resp_content]
-            _response = []
             keys_to_filter = [
                 "resultsUrl",
                 "algorithmLogUrl",
@@ -249,9 +253,8 @@ def computeStatus():
             for job_info in resp_content:
                 for k in keys_to_filter:
                     job_info.pop(k, None)
-                _response.append(job_info)
 
-            _response = json.dumps(_response)
+            _response = json.dumps(resp_content)
 
         return Response(
             _response,
@@ -335,20 +338,21 @@ def computeStart():
 
         payload = {
             "workflow": workflow,
-            "providerSignature": sign_message(msg_to_sign, provider_wallet),
+            "providerSignature": sign_message_cached(msg_to_sign, provider_wallet),
             "documentId": did,
             "agreementId": tx_id,
             "owner": consumer_address,
             "providerAddress": provider_wallet.address,
         }
         response = requests_session.post(
-            get_compute_endpoint(),
+            compute_endpoint,
             data=json.dumps(payload),
             headers=standard_headers,
+            stream=True,
         )
         increment_nonce(consumer_address)
         return Response(
-            response.content,
+            response.iter_content(chunk_size=get_config().requests_chunk_size),
             response.status_code,
             headers=standard_headers,
         )
@@ -396,10 +400,9 @@ def computeResult():
     """
     data = get_request_data(request)
     logger.info(f"computeResult endpoint called. {data}")
-    url = get_compute_result_endpoint()
     msg_to_sign = f"{data.get('jobId')}{data.get('index')}{data.get('consumerAddress')}"
     # we sign the same message as consumer does, but using our key
-    provider_signature = sign_message(msg_to_sign, provider_wallet)
+    provider_signature = sign_message_cached(msg_to_sign, provider_wallet)
     params = {
         "index": data.get("index"),
         "consumerAddress": data.get("consumerAddress"),
@@ -407,9 +410,7 @@ def computeResult():
         "consumerSignature": data.get("signature"),
         "providerSignature": provider_signature,
     }
-    req = PreparedRequest()
-    req.prepare_url(url, params)
-    result_url = req.url
+    result_url = f"{compute_result_endpoint}?{urlencode(params)}"
     logger.debug(f"Done processing computeResult, url: {result_url}")
     increment_nonce(data.get("consumerAddress"))
     try:
@@ -4,21 +4,23 @@
 #
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
 
+from cachetools import TTLCache
 from eth_utils import add_0x_prefix
 from flask import Response, jsonify, request
 from flask_sieve import validate
 from ocean_lib.common.agreements.service_types import ServiceTypes
 from ocean_lib.common.did import did_to_id
-from ocean_lib.common.http_requests.requests_session import get_requests_session
 from ocean_provider.log import setup_logging
 from ocean_provider.myapp import app
 from ocean_provider.user_nonce import get_nonce, increment_nonce
 from ocean_provider.utils.basics import (
-    LocalFileAdapter,
     get_asset_from_metadatastore,
     get_datatoken_minter,
     get_provider_wallet,
+    get_requests_session,
     get_web3,
 )
 from ocean_provider.utils.encryption import do_encrypt
@@ -50,11 +52,18 @@ from . import services
 
 setup_logging()
 provider_wallet = get_provider_wallet()
-requests_session = get_requests_session()
-requests_session.mount("file://", LocalFileAdapter())
+requests_session = get_requests_session(allow_local_files=True)
+metadata_url = get_metadata_url()
 
 logger = logging.getLogger(__name__)
 
+# json.dumps() builds a new encoder whenever separators are passed
+compact_json_encoder = json.JSONEncoder(separators=(",", ":"))
+
+# download urls that recently passed `check_url_details`, see `initialize`
+_valid_url_cache = TTLCache(maxsize=4096, ttl=60)
+_valid_url_cache_lock = Lock()
+
 
 @services.route("/nonce", methods=["GET"])
 @validate(NonceRequest)
@@ -120,7 +129,7 @@ def encrypt():
     data = get_request_data(request)
     logger.info(f"encrypt endpoint called. {data}")
     did = data.get("documentId")
-    document = json.dumps(json.loads(data.get("document")), separators=(",", ":"))
+    document = compact_json_encoder.encode(json.loads(data.get("document")))
     publisher_address = data.get("publisherAddress")
 
     try:
@@ -176,7 +185,7 @@ def fileinfo():
     url = data.get("url")
 
     if did:
-        asset = get_asset_from_metadatastore(get_metadata_url(), did)
+        asset = get_asset_from_metadatastore(metadata_url, did)
         url_list = get_asset_download_urls(
             asset, provider_wallet, config_file=app.config["PROVIDER_CONFIG_FILE"]
         )
@@ -185,9 +194,15 @@ def fileinfo():
 
     with_checksum = data.get("checksum", False)
 
+    # the checks are independent network round trips, so run them side by side
+    with ThreadPoolExecutor(max_workers=max(1, min(16, len(url_list)))) as executor:
+        results = executor.map(
+            lambda _url: check_url_details(_url, with_checksum=with_checksum),
+            url_list,
+        )
+
     files_info = []
-    for i, url in enumerate(url_list):
-        valid, details = check_url_details(url, with_checksum=with_checksum)
+    for i, (valid, details) in enumerate(results):
         info = {"index": i, "valid": valid}
         info.update(details)
         files_info.append(info)
@@ -237,7 +252,7 @@ def initialize():
         url = get_asset_url_at_index(0, asset, provider_wallet)
         download_url = get_download_url(url, app.config["PROVIDER_CONFIG_FILE"])
         download_url = append_userdata(download_url, data)
-        valid, _ = check_url_details(download_url)
+        valid = _check_download_url(download_url)
 
         if not valid:
             logger.error(
@@ -270,6 +285,24 @@ def initialize():
         return service_unavailable(e, data, logger)
 
 
+def _check_download_url(download_url):
+    """
+    Returns True if `download_url` is valid and available. Successful checks
+    are remembered for a minute, so initializing the same asset again does
+    not probe its url each time.
+    """
+    with _valid_url_cache_lock:
+        if download_url in _valid_url_cache:
+            return True
+
+    valid, _ = check_url_details(download_url)
+    if valid:
+        with _valid_url_cache_lock:
+            _valid_url_cache[download_url] = True
+
+    return valid
+
+
 @services.route("/download", methods=["GET"])
 @validate(DownloadRequest)
 def download():
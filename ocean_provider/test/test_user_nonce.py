@@ -0,0 +1,89 @@
+#
+# Copyright 2021 Ocean Protocol Foundation
+# SPDX-License-Identifier: Apache-2.0
+#
+import secrets
+import threading
+
+from ocean_provider import models
+from ocean_provider.myapp import app
+from ocean_provider.user_nonce import (
+    get_and_increment_nonce,
+    get_nonce,
+    increment_nonce,
+)
+
+FIRST_NONCE = models.UserNonce.FIRST_NONCE
+
+
+def _new_address():
+    # a fresh address per test, the nonce table is shared with other test runs
+    return "0x" + secrets.token_hex(20)
+
+
+def _run_concurrently(target, n_threads):
+    def _worker():
+        try:
+            target()
+        finally:
+            app.session.remove()
+
+    threads = [threading.Thread(target=_worker) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_get_nonce_first_use():
+    assert get_nonce(_new_address()) == FIRST_NONCE
+
+
+def test_get_and_increment_nonce_first_use():
+    address = _new_address()
+    assert get_and_increment_nonce(address) == FIRST_NONCE
+    assert int(get_nonce(address)) == FIRST_NONCE + 1
+
+
+def test_get_and_increment_nonce_consecutive():
+    address = _new_address()
+    nonces = [get_and_increment_nonce(address) for _ in range(5)]
+    assert nonces == list(range(FIRST_NONCE, FIRST_NONCE + 5))
+    assert int(get_nonce(address)) == FIRST_NONCE + 5
+
+
+def test_increment_nonce():
+    address = _new_address()
+    increment_nonce(address)
+    assert int(get_nonce(address)) == FIRST_NONCE + 1
+
+    increment_nonce(address)
+    assert int(get_nonce(address)) == FIRST_NONCE + 2
+    assert get_and_increment_nonce(address) == FIRST_NONCE + 2
+
+
+def test_concurrent_increment_nonce():
+    address = _new_address()
+    n_threads, n_calls = 8, 10
+
+    def _increment():
+        for _ in range(n_calls):
+            increment_nonce(address)
+
+    _run_concurrently(_increment, n_threads)
+    assert int(get_nonce(address)) == FIRST_NONCE + n_threads * n_calls
+
+
+def test_concurrent_get_and_increment_nonce():
+    address = _new_address()
+    n_threads, n_calls = 8, 10
+    nonces = []
+
+    def _get_and_increment():
+        nonces.extend(get_and_increment_nonce(address) for _ in range(n_calls))
+
+    _run_concurrently(_get_and_increment, n_threads)
+    # every request got its own nonce and none of the increments was lost
+    total = n_threads * n_calls
+    assert sorted(nonces) == list(range(FIRST_NONCE, FIRST_NONCE + total))
+    assert int(get_nonce(address)) == FIRST_NONCE + total
@@ -4,6 +4,9 @@
 #
 import logging
 
+from sqlalchemy import Integer, cast
+from sqlalchemy.exc import IntegrityError
+
 from ocean_provider import models
 from ocean_provider.myapp import app
 
@@ -15,7 +18,7 @@ def get_nonce(address):
     """
     :return: `nonce`
     """
-    result = models.UserNonce.query.filter_by(address=address).first()
+    result = models.UserNonce.query.get(address)
 
     return result.nonce if result else models.UserNonce.FIRST_NONCE
 
@@ -25,18 +28,50 @@ def increment_nonce(address):
     Increatements the value of `nonce`
     :param: address
     """
-    nonce_object = models.UserNonce.query.filter_by(address=address).first()
-    if nonce_object:
-        nonce_value = nonce_object.nonce
-    else:
-        nonce_object = models.UserNonce(address=address)
-        nonce_value = models.UserNonce.FIRST_NONCE
+    logger.debug(f"increment_nonce: {address}")
+    try:
+        _increment_nonce(address)
+    except IntegrityError:
+        # a concurrent request inserted the first nonce for this address
+        db.rollback()
+        _increment_nonce(address)
 
-    logger.debug(
-        f"increment_nonce: {address}, {nonce_value}, "
-        "new nonce {int(nonce_value) + 1}"
-    )
 
-    nonce_object.nonce = int(nonce_value) + 1
-    db.add(nonce_object)
+def get_and_increment_nonce(address):
+    """
+    Increments the value of `nonce` and returns the value it had before, in
+    one transaction, so no other request can consume the same `nonce`.
+    :param: address
+    :return: `nonce` before the increment
+    """
+    logger.debug(f"get_and_increment_nonce: {address}")
+    try:
+        nonce = _increment_nonce(address, read_back=True)
+    except IntegrityError:
+        db.rollback()
+        nonce = _increment_nonce(address, read_back=True)
+
+    return nonce - 1
+
+
+def _increment_nonce(address, read_back=False):
+    """
+    Increments the stored nonce in a single UPDATE statement, so concurrent
+    requests for the same address cannot overwrite each other's increment.
+    :return: the new `nonce` if `read_back` is set, else None
+    """
+    nonce = None
+    updated = models.UserNonce.query.filter_by(address=address).update(
+        {models.UserNonce.nonce: cast(models.UserNonce.nonce, Integer) + 1},
+        synchronize_session=False,
+    )
+    if not updated:
+        nonce = models.UserNonce.FIRST_NONCE + 1
+        db.add(models.UserNonce(address=address, nonce=nonce))
+    elif read_back:
+        nonce = int(
+            db.query(models.UserNonce.nonce).filter_by(address=address).scalar()
+        )
     db.commit()
+
+    return nonce
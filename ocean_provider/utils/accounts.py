@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 from datetime import datetime
+from functools import lru_cache
 import logging
 import eth_keys
 from eth_account.account import Account
@@ -107,3 +108,17 @@ def sign_message(message, wallet):
     )
 
     return signed.signature.hex()
+
+
+@lru_cache(maxsize=16384)
+def sign_message_cached(message, wallet):
+    """
+    Memoized `sign_message`, for messages the provider signs over and over
+    (e.g. the same job polled for status). Signatures are deterministic, so
+    a cached one is identical to a fresh one. Do not use it for messages
+    that embed a timestamp or nonce, they would only fill the cache.
+    :param message: str
+    :param wallet: Wallet instance
+    :return: `hex` value of the signed message
+    """
+    return sign_message(message, wallet)
@@ -3,32 +3,49 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 import os
+from functools import lru_cache
 from pathlib import Path
+from threading import Lock
 from typing import Optional
 
 import requests
+from cachetools import TTLCache
 from ocean_lib.common.aquarius.aquarius import Aquarius
 from ocean_lib.models.data_token import DataToken
 from ocean_lib.ocean.util import get_web3_connection_provider
 from ocean_lib.web3_internal.wallet import Wallet
 from requests_testadapter import Resp
+from urllib3.util.retry import Retry
 
 import artifacts
 from ocean_provider.config import Config
 from web3.main import Web3
 
 
+_asset_cache = TTLCache(maxsize=4096, ttl=30)
+_asset_cache_lock = Lock()
+
+
 def get_config(config_file: Optional[str] = None) -> Config:
     """
     :return: Config instance
     """
-    return Config(
-        filename=config_file
+    return _get_config(
+        config_file
         if config_file is not None
         else os.getenv("PROVIDER_CONFIG_FILE", "config.ini")
     )
 
 
+@lru_cache(maxsize=None)
+def _get_config(config_file: str) -> Config:
+    """
+    Parses each config file (and the environment overrides) once per process.
+    """
+    return Config(filename=config_file)
+
+
+@lru_cache(maxsize=None)
 def get_provider_wallet(web3: Optional[Web3] = None) -> Wallet:
     """
     :return: Wallet instance
@@ -54,11 +71,20 @@ def get_provider_wallet(web3: Optional[Web3] = None) -> Wallet:
     return wallet
 
 
+@lru_cache(maxsize=4096)
+def get_datatoken(web3: Web3, datatoken_address: str) -> DataToken:
+    """
+    :return: `DataToken` instance, built once per web3 and token address since
+    binding the contract ABI is the costly part and the contract keeps no state
+    """
+    return DataToken(web3, datatoken_address)
+
+
 def get_datatoken_minter(datatoken_address):
     """
     :return: Eth account address of the Datatoken minter
     """
-    dt = DataToken(get_web3(), datatoken_address)
+    dt = get_datatoken(get_web3(), datatoken_address)
     publisher = dt.minter()
     return publisher
 
@@ -77,6 +103,15 @@ def get_web3(network_url: Optional[str] = None) -> Web3:
     if network_url is None:
         network_url = get_config().network_url
 
+    return _get_web3(network_url)
+
+
+@lru_cache(maxsize=None)
+def _get_web3(network_url: str) -> Web3:
+    """
+    Builds one `Web3` instance per network url, so its connection provider
+    (and the keep-alive session behind it) is reused across requests.
+    """
     web3 = Web3(provider=get_web3_connection_provider(network_url))
 
     if network_url.startswith("wss"):
@@ -91,12 +126,9 @@ class LocalFileAdapter(requests.adapters.HTTPAdapter):
     def build_response_from_file(self, request):
         file_path = request.url[7:]
         with open(file_path, "rb") as file:
-            buff = bytearray(os.path.getsize(file_path))
-            file.readinto(buff)
-            resp = Resp(buff)
-            r = self.build_response(request, resp)
+            resp = Resp(file.read())
 
-            return r
+        return self.build_response(request, resp)
 
     def send(
         self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
@@ -105,9 +137,66 @@ class LocalFileAdapter(requests.adapters.HTTPAdapter):
         return self.build_response_from_file(request)
 
 
+@lru_cache(maxsize=None)
+def get_requests_session(
+    allow_local_files: bool = False, with_retries: bool = False
+) -> requests.Session:
+    """
+    :param allow_local_files: also serve `file://` urls, through `LocalFileAdapter`
+    :param with_retries: retry connection errors and 502/503/504 responses, only
+    meant for the provider's own services (e.g. the operator service), never for
+    user supplied urls
+    :return: `requests.Session` shared by the provider, keeping a sized pool of
+    keep-alive connections per host
+    """
+    session = requests.Session()
+    adapter = _get_http_adapter(with_retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if allow_local_files:
+        session.mount("file://", LocalFileAdapter())
+
+    return session
+
+
+@lru_cache(maxsize=None)
+def _get_http_adapter(with_retries: bool) -> requests.adapters.HTTPAdapter:
+    if with_retries:
+        max_retries = Retry(
+            total=2,
+            backoff_factor=0.1,
+            status_forcelist=[502, 503, 504],
+            raise_on_status=False,
+        )
+    else:
+        max_retries = Retry(total=0)
+
+    return requests.adapters.HTTPAdapter(
+        pool_connections=32, pool_maxsize=64, max_retries=max_retries
+    )
+
+
 def get_asset_from_metadatastore(metadata_url, document_id):
     """
-    :return: `Ddo` instance
+    :return: `Ddo` instance, reused for a few seconds when the same asset is
+    requested again (retries, downloads of the other files of an asset)
+    """
+    key = (metadata_url, document_id)
+    with _asset_cache_lock:
+        asset = _asset_cache.get(key)
+
+    if asset is None:
+        asset = _get_aquarius(metadata_url).get_asset_ddo(document_id)
+        if asset:
+            with _asset_cache_lock:
+                _asset_cache[key] = asset
+
+    return asset
+
+
+@lru_cache(maxsize=None)
+def _get_aquarius(metadata_url):
+    """
+    :return: `Aquarius` client, one per metadata url so its session is reused
     """
-    aqua = Aquarius(metadata_url)
-    return aqua.get_asset_ddo(document_id)
+    return Aquarius(metadata_url)
@@ -5,6 +5,8 @@ from ocean_provider.utils.accounts import (
     generate_auth_token,
     get_private_key,
     is_auth_token_valid,
+    sign_message,
+    sign_message_cached,
     verify_signature,
 )
 
@@ -43,3 +45,11 @@ def test_auth_token():
 
 def test_generate_auth_token(consumer_wallet):
     assert generate_auth_token(consumer_wallet)
+
+
+def test_sign_message_cached(provider_wallet):
+    message = f"{provider_wallet.address}some-did"
+    signature = sign_message_cached(message, provider_wallet)
+    assert signature == sign_message(message, provider_wallet)
+    assert sign_message_cached(message, provider_wallet) == signature
+    assert sign_message_cached.cache_info().hits >= 1
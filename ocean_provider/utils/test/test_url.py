@@ -3,8 +3,15 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 import logging
+from unittest.mock import patch
 
-from ocean_provider.utils.url import is_safe_schema, is_safe_url, is_this_same_provider
+from ocean_provider.config import Config
+from ocean_provider.utils.url import (
+    is_ip,
+    is_safe_schema,
+    is_safe_url,
+    is_this_same_provider,
+)
 
 test_logger = logging.getLogger(__name__)
 
@@ -14,6 +21,14 @@ def test_is_safe_schema():
     assert is_safe_schema("127.0.0.1") is False
     assert is_safe_schema("169.254.169.254") is False
     assert is_safe_schema("http://169.254.169.254/latest/meta-data/hostname") is True
+    assert is_safe_schema("http://example.com\t@127.0.0.1/") is False
+
+
+def test_is_ip():
+    assert is_ip("169.254.169.254") is True
+    assert is_ip("::1") is True
+    assert is_ip("jsonplaceholder.typicode.com") is False
+    assert is_ip("1234") is False
 
 
 def test_is_safe_url():
@@ -23,5 +38,49 @@ def test_is_safe_url():
     assert is_safe_url("http://169.254.169.254/latest/meta-data/hostname") is False
 
 
+def test_is_safe_url_non_public_ip_disallowed():
+    config = Config(options_dict={"resources": {"allow_non_public_ip": "False"}})
+    assert config.allow_non_public_ip is False
+    with patch("ocean_provider.utils.url.get_config", return_value=config):
+        assert is_safe_url("http://169.254.169.254/latest/meta-data/") is False
+        assert is_safe_url("http://127.0.0.1/") is False
+        assert is_safe_url("http://127.0.0.1:8080/") is False
+        assert is_safe_url("http://user@10.0.0.1/") is False
+        assert is_safe_url("http://[::1]/") is False
+        assert is_safe_url("http://[::1]:8080/") is False
+        # ipv4 forms that ipaddress rejects, but getaddrinfo still connects to
+        assert is_safe_url("http://127.1/") is False
+        assert is_safe_url("http://2130706433/") is False
+        assert is_safe_url("http://0177.0.0.1/") is False
+        assert is_safe_url("http://10.1/") is False
+
+
+def test_is_safe_url_failed_lookup():
+    assert is_safe_url("http://does-not-exist.invalid/") is False
+
+
+def test_is_safe_url_safe_hosts():
+    config = Config(
+        options_dict={
+            "resources": {"safe_hosts": "169.254.169.254, trusted.internal:8080"}
+        }
+    )
+    with patch("ocean_provider.utils.url.get_config", return_value=config):
+        assert is_safe_url("http://169.254.169.254/latest/meta-data/hostname")
+        assert is_safe_url("http://trusted.internal:8080/file")
+        assert is_safe_url("http://127.0.0.1/") is False
+
+
+def test_is_safe_url_safe_hosts_whitespace():
+    config = Config(options_dict={"resources": {"safe_hosts": "trusted.internal"}})
+    with patch("ocean_provider.utils.url.get_config", return_value=config):
+        assert is_safe_url("http://trusted.internal/file")
+        # the request would go to 127.0.0.1, not to the allowlisted host
+        assert is_safe_url("http://trusted.internal@127.0.0.1/") is False
+        assert is_safe_url("http://trusted.internal\t@127.0.0.1/") is False
+        assert is_safe_url("http://trusted.internal @127.0.0.1/") is False
+        assert is_safe_url("http://trusted.internal\n@127.0.0.1/") is False
+
+
 def test_is_same_provider():
     assert is_this_same_provider("http://localhost:8030")
@@ -6,7 +6,7 @@ import json
 import logging
 import mimetypes
 from copy import deepcopy
-from unittest.mock import MagicMock, Mock
+from unittest.mock import MagicMock, Mock, patch
 
 import ipfshttpclient
 import pytest
@@ -46,7 +46,9 @@ def test_service_unavailable(caplog):
     assert caplog.records[0].msg == "Payload was: item1=test1,item2=test2"
 
 
-def test_build_download_response():
+# the source hosts below do not resolve, and unresolvable urls are unsafe
+@patch("ocean_provider.utils.util.is_safe_url", return_value=True)
+def test_build_download_response(mock_is_safe_url):
     request = Mock()
     request.range = None
 
@@ -138,6 +140,36 @@ def test_build_download_response():
     )
 
 
+@patch("ocean_provider.utils.util.is_safe_url", return_value=True)
+def test_build_download_response_unsafe_attachment_filename(mock_is_safe_url):
+    request = Mock()
+    request.range = None
+
+    class Dummy:
+        pass
+
+    url = "https://source-lllllll.cccc/filename.csv"
+    for content_disposition in [
+        "attachment; filename*=UTF-8''%E2%82%AC.csv",
+        "attachment; filename*=UTF-8''evil%0d%0aSet-Cookie:%20a=b.csv",
+        'attachment; filename="\u20ac.csv"',
+    ]:
+        mocked_response = Dummy()
+        mocked_response.content = b"asdsadf"
+        mocked_response.status_code = 200
+        mocked_response.headers = {"content-disposition": content_disposition}
+
+        requests_session = Dummy()
+        requests_session.get = MagicMock(return_value=mocked_response)
+
+        response = build_download_response(request, requests_session, url, url, None)
+        # falls back on the filename from the url
+        assert (
+            response.headers.get_all("Content-Disposition")[0]
+            == "attachment;filename=filename.csv"
+        )
+
+
 def test_download_ipfs_file():
     client = ipfshttpclient.connect("/dns/172.15.0.16/tcp/5001/http")
     cid = client.add("./tests/resources/ddo_sample_file.txt")["Hash"]
@@ -6,45 +6,101 @@ import hashlib
 import ipaddress
 import json
 import logging
+import re
 import requests
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from urllib.parse import urlparse
 
 import dns.resolver
 from requests.models import PreparedRequest
-from ocean_lib.data_provider.data_service_provider import DataServiceProvider
 
-from ocean_provider.utils.basics import get_config, get_provider_wallet
+from ocean_provider.utils.basics import (
+    get_config,
+    get_provider_wallet,
+    get_requests_session,
+)
 
 logger = logging.getLogger(__name__)
+CHECKSUM_CHUNK_SIZE = 262144
+SCHEME_NETLOC_RE = re.compile(r"^[a-z][a-z0-9+.\-]*://([^\s/?#]+)", re.IGNORECASE)
+UNSAFE_URL_CHARS_RE = re.compile(r"[\s\x00-\x1f\x7f]")
+
+# the same url goes through several checks per request; ParseResult is
+# immutable, so a bounded cache is safe to share
+_urlparse_cached = lru_cache(maxsize=4096)(urlparse)
 
 
 def is_safe_url(url):
-    if not is_safe_schema(url):
+    if not _get_netloc(url):
+        return False
+
+    try:
+        # without userinfo, port and ipv6 brackets, so ip literals are detected
+        result = _urlparse_cached(url)
+        hostname, port = result.hostname, result.port
+    except ValueError:
         return False
 
-    result = urlparse(url)
+    if not hostname:
+        return False
+
+    # match the host that will actually be requested, not the raw netloc
+    host = f"[{hostname}]" if ":" in hostname else hostname
+    if port is not None:
+        host = f"{host}:{port}"
+    if host in get_config().safe_hosts:
+        # allowlisted hosts skip the dns resolution and ip class validation
+        return True
 
-    return is_safe_domain(result.netloc)
+    return is_safe_domain(hostname)
 
 
 def is_safe_schema(url):
+    return bool(_get_netloc(url))
+
+
+def _get_netloc(url):
+    """Returns the netloc of `url` if it has both a scheme and a netloc, else None."""
+    if not isinstance(url, str) or UNSAFE_URL_CHARS_RE.search(url):
+        # urlparse strips or skips whitespace and control characters, so the
+        # authority it sees could differ from the one matched here
+        return None
+
+    match = SCHEME_NETLOC_RE.match(url)
+    return match.group(1) if match else None
+
+
+def is_ip(address):
     try:
-        result = urlparse(url)
-        return all([result.scheme, result.netloc])
-    except:  # noqa
+        ipaddress.ip_address(address)
+        return True
+    except ValueError:
         return False
 
 
-def is_ip(address):
-    return address.replace(".", "").isnumeric()
+def _get_ip_literal(domain):
+    """
+    Returns `domain` as a standard ip address string if it is an ip literal,
+    including the shorthand, decimal, octal and hex ipv4 forms (e.g. "127.1",
+    "2130706433", "0177.0.0.1") that `getaddrinfo` would connect to, else None.
+    """
+    if is_ip(domain):
+        return domain
+
+    try:
+        return socket.inet_ntoa(socket.inet_aton(domain))
+    except (OSError, ValueError):
+        return None
 
 
 def is_this_same_provider(url):
-    result = urlparse(url)
+    result = _urlparse_cached(url)
     try:
-        provider_info = DataServiceProvider._http_method(
-            "get", f"{result.scheme}://{result.netloc}/"
-        ).json()
+        provider_info = (
+            get_requests_session().get(f"{result.scheme}://{result.netloc}/").json()
+        )
         address = provider_info["providerAddress"]
     except (requests.exceptions.RequestException, KeyError):
         address = None
@@ -52,10 +108,26 @@ def is_this_same_provider(url):
     return address and address.lower() == get_provider_wallet().address.lower()
 
 
+@lru_cache(maxsize=1)
+def _get_dns_resolver():
+    """
+    :return: resolver shared by all lookups, so /etc/resolv.conf is parsed once
+    and repeated lookups are answered from its cache within the record ttl
+    """
+    resolver = dns.resolver.Resolver()
+    resolver.cache = dns.resolver.LRUCache(max_size=10000)
+    return resolver
+
+
 def _get_records(domain, record_type):
-    DNS_RESOLVER = dns.resolver.Resolver()
     try:
-        return DNS_RESOLVER.resolve(domain, record_type, search=True)
+        # pass the timeout per query, the shared resolver is never mutated
+        return _get_dns_resolver().resolve(
+            domain, record_type, search=True, lifetime=get_config().requests_timeout
+        )
+    except dns.resolver.NoAnswer:
+        # the domain exists, it just has no records of this type
+        return []
     except Exception as e:
         logger.info(f"[i] Cannot get {record_type} record for domain {domain}: {e}\n")
 
@@ -63,26 +135,43 @@ def _get_records(domain, record_type):
 
 
 def is_safe_domain(domain):
-    ip_v4_records = _get_records(domain, "A")
-    ip_v6_records = _get_records(domain, "AAAA")
+    ip_literal = _get_ip_literal(domain)
+    if ip_literal:
+        # an ip literal has no records of its own, validate it directly
+        return validate_dns_record(ip_literal, domain, "")
+
+    # both lookups are network bound, resolve AAAA on a thread of this call
+    # while A is resolved here; each lookup is bounded by its own lifetime and
+    # no pool is shared, so slow domains cannot stall other requests' checks
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        ip_v6_future = executor.submit(_get_records, domain, "AAAA")
+        ip_v4_records = _get_records(domain, "A")
+        if not validate_dns_records(domain, ip_v4_records, "A"):
+            # already unsafe, drop the AAAA lookup if it has not started yet
+            ip_v6_future.cancel()
+            return False
 
-    result = validate_dns_records(domain, ip_v4_records, "A") and validate_dns_records(
-        domain, ip_v6_records, "AAAA"
-    )
+        ip_v6_records = ip_v6_future.result()
+    finally:
+        executor.shutdown(wait=False)
 
-    if not is_ip(domain):
-        return result
+    if not validate_dns_records(domain, ip_v6_records, "AAAA"):
+        return False
 
-    return result and validate_dns_records(domain, domain, "")
+    # a domain without any address can only be reached through sources the
+    # checks above did not see (e.g. the hosts file)
+    return bool(ip_v4_records or ip_v6_records)
 
 
 def validate_dns_records(domain, records, record_type):
     """
     Verify if all DNS records resolve to public IP addresses.
-    Return True if they do, False if any error has been detected.
+    Return True if they do, False if any error has been detected, including a
+    failed lookup (`records` is None).
     """
     if records is None:
-        return True
+        return False
 
     for record in records:
         if not validate_dns_record(record, domain, record_type):
@@ -140,16 +229,10 @@ def check_url_details(url, with_checksum=False):
 
             if not content_length and content_range:
                 # sometimes servers send content-range instead
-                try:
-                    content_length = content_range.split("-")[1]
-                except IndexError:
-                    pass
+                content_length = content_range.partition("-")[2] or None
 
             if content_type:
-                try:
-                    content_type = content_type.split(";")[0]
-                except IndexError:
-                    pass
+                content_type = content_type.partition(";")[0]
 
             if content_type or content_length:
                 details = {
@@ -169,33 +252,41 @@ def check_url_details(url, with_checksum=False):
 
 def _get_result_from_url(url, with_checksum=False):
     timeout = get_config().requests_timeout
-    chunk_size = get_config().requests_chunk_size
-
-    for method in ["head", "options"]:
-        func = getattr(requests, method)
-        result = func(url, timeout=timeout, headers={"Accept-Encoding": "identity"})
-
-        if (
-            not with_checksum
-            and result.status_code == 200
-            and (
-                result.headers.get("Content-Type")
-                or result.headers.get("Content-Range")
-            )
-            and result.headers.get("Content-Length")
-        ):
-            return result, {}
 
+    requests_session = get_requests_session()
     if not with_checksum:
+        # HEAD is the cheap probe, OPTIONS only gets a chance if it falls short
+        for method in ["head", "options"]:
+            func = getattr(requests_session, method)
+            result = func(
+                url,
+                timeout=timeout,
+                headers={"Accept-Encoding": "identity"},
+                allow_redirects=True,
+            )
+
+            if (
+                result.status_code == 200
+                and (
+                    result.headers.get("Content-Type")
+                    or result.headers.get("Content-Range")
+                )
+                and result.headers.get("Content-Length")
+            ):
+                return result, {}
+
         # fallback on GET request
-        return requests.get(url, stream=True, timeout=timeout), {}
+        return requests_session.get(url, stream=True, timeout=timeout), {}
 
+    # hash in large blocks, so that the per chunk python overhead stays small
+    chunk_size = max(get_config().requests_chunk_size, CHECKSUM_CHUNK_SIZE)
     sha = hashlib.sha256()
+    sha_update = sha.update
 
-    with requests.get(url, stream=True) as r:
+    with requests_session.get(url, stream=True) as r:
         r.raise_for_status()
         for chunk in r.iter_content(chunk_size=chunk_size):
-            sha.update(chunk)
+            sha_update(chunk)
 
     return r, {"checksum": sha.hexdigest(), "checksumType": "sha256"}
 
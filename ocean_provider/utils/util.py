@@ -7,21 +7,22 @@ import json
 import logging
 import mimetypes
 import os
-from cgi import parse_header
+from email.message import Message
+from functools import lru_cache
 
-import requests
 from flask import Response, request
 from ocean_lib.common.agreements.consumable import ConsumableCodes
-from ocean_lib.models.data_token import DataToken
 from ocean_lib.web3_internal.currency import to_wei
 from osmosis_driver_interface.osmosis import Osmosis
 from websockets import ConnectionClosed
 
-from ocean_provider.utils.accounts import sign_message
+from ocean_provider.utils.accounts import sign_message_cached
 from ocean_provider.utils.basics import (
     get_asset_from_metadatastore,
     get_config,
+    get_datatoken,
     get_provider_wallet,
+    get_requests_session,
     get_web3,
 )
 from ocean_provider.utils.encryption import do_decrypt
@@ -31,6 +32,10 @@ from ocean_provider.utils.url import is_safe_url
 setup_logging()
 logger = logging.getLogger(__name__)
 
+# a provider only ever sees a handful of file types, keep the lookups cached
+_guess_type = lru_cache(maxsize=512)(mimetypes.guess_type)
+_guess_extension = lru_cache(maxsize=512)(mimetypes.guess_extension)
+
 
 def get_metadata_url():
     return get_config().aquarius_url
@@ -66,8 +71,9 @@ def build_download_response(
 
             content_disposition_header = response.headers.get("content-disposition")
             if content_disposition_header:
-                _, content_disposition_params = parse_header(content_disposition_header)
-                content_filename = content_disposition_params.get("filename")
+                content_filename = _get_content_disposition_filename(
+                    content_disposition_header
+                )
                 if content_filename:
                     filename = content_filename
 
@@ -77,10 +83,10 @@ def build_download_response(
 
             file_ext = os.path.splitext(filename)[1]
             if file_ext and not content_type:
-                content_type = mimetypes.guess_type(filename)[0]
+                content_type = _guess_type(filename)[0]
             elif not file_ext and content_type:
                 # add an extension to filename based on the content_type
-                extension = mimetypes.guess_extension(content_type)
+                extension = _guess_extension(content_type)
                 if extension:
                     filename = filename + extension
 
@@ -91,7 +97,8 @@ def build_download_response(
             }
 
         def _generate(_response):
-            for chunk in _response.iter_content(chunk_size=4096):
+            chunk_size = get_config().requests_chunk_size
+            for chunk in _response.iter_content(chunk_size=chunk_size):
                 if chunk:
                     yield chunk
 
@@ -106,6 +113,29 @@ def build_download_response(
         raise
 
 
+def _get_content_disposition_filename(content_disposition_header):
+    """
+    Returns the plain `filename` parameter of a content-disposition header, or
+    None if it is missing or unsafe to send back in our own response header.
+    """
+    content_disposition = Message()
+    content_disposition["content-disposition"] = content_disposition_header
+    filename = content_disposition.get_param("filename", header="content-disposition")
+    if not filename or not isinstance(filename, str):
+        # RFC 2231 `filename*` values come back as tuples and are not supported
+        return None
+
+    if any(ord(char) < 0x20 or ord(char) == 0x7F for char in filename):
+        return None
+
+    try:
+        filename.encode("latin-1")
+    except UnicodeEncodeError:
+        return None
+
+    return filename
+
+
 def get_asset_files_list(asset, wallet):
     try:
         encrypted_files = asset.encrypted_files
@@ -153,27 +183,30 @@ def get_asset_urls(asset, wallet):
         files_list = get_asset_files_list(asset, wallet)
         if not files_list:
             return []
-        input_urls = []
-        for i, file_meta_dict in enumerate(files_list):
-            if not file_meta_dict or not isinstance(file_meta_dict, dict):
-                raise TypeError(
-                    f"Invalid file meta at index {i}, expected a dict, got a "
-                    f"{type(file_meta_dict)}."
-                )
-            if "url" not in file_meta_dict:
-                raise ValueError(
-                    f'The "url" key is not found in the '
-                    f"file dict {file_meta_dict} at index {i}."
-                )
 
-            input_urls.append(file_meta_dict["url"])
+        for i, file_meta_dict in enumerate(files_list):
+            _validate_file_meta(file_meta_dict, i)
 
-        return input_urls
+        return [file_meta_dict["url"] for file_meta_dict in files_list]
     except Exception as e:
         logger.error(f"Error decrypting urls for asset {asset.did}: {str(e)}")
         raise
 
 
+def _validate_file_meta(file_meta_dict, index):
+    """Raises if `file_meta_dict` is not a file dict with an url."""
+    if not file_meta_dict or not isinstance(file_meta_dict, dict):
+        raise TypeError(
+            f"Invalid file meta at index {index}, expected a dict, got a "
+            f"{type(file_meta_dict)}."
+        )
+    if "url" not in file_meta_dict:
+        raise ValueError(
+            f'The "url" key is not found in the '
+            f"file dict {file_meta_dict} at index {index}."
+        )
+
+
 def get_asset_download_urls(asset, wallet, config_file):
     return [get_download_url(url, config_file) for url in get_asset_urls(asset, wallet)]
 
@@ -200,7 +233,11 @@ def get_compute_result_endpoint():
 
 def get_compute_info():
     try:
-        compute_info = requests.get(get_config().operator_service_url).json()
+        compute_info = (
+            get_requests_session(with_retries=True)
+            .get(get_config().operator_service_url)
+            .json()
+        )
         limits = {
             "algoTimeLimit": compute_info.get("algoTimeLimit"),
             "storageExpiry": compute_info.get("storageExpiry"),
@@ -218,7 +255,7 @@ def validate_order(web3, sender, token_address, num_tokens, tx_id, did, service_
         f"sender={sender}, num_tokens={num_tokens}, token_address={token_address}"
     )
 
-    dt_contract = DataToken(web3, token_address)
+    dt_contract = get_datatoken(web3, token_address)
 
     amount = to_wei(str(num_tokens))
     num_tries = 3
@@ -305,19 +342,19 @@ def process_compute_request(data):
         f'{body.get("jobId", "")}'
         f'{body.get("documentId", "")}'
     )  # noqa
-    body["providerSignature"] = sign_message(msg_to_sign, provider_wallet)
+    body["providerSignature"] = sign_message_cached(msg_to_sign, provider_wallet)
 
     return body
 
 
 def filter_dictionary(dictionary, keys):
     """Filters a dictionary from a list of keys."""
-    return {key: dictionary[key] for key in dictionary if key in keys}
+    return {key: dictionary[key] for key in keys if key in dictionary}
 
 
 def filter_dictionary_starts_with(dictionary, prefix):
     """Filters a dictionary from a key prefix."""
-    return {key: dictionary[key] for key in dictionary if key.startswith(prefix)}
+    return {key: value for key, value in dictionary.items() if key.startswith(prefix)}
 
 
 def decode_from_data(data, key, dec_type="list"):
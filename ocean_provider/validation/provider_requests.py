@@ -23,24 +23,26 @@ class CustomJsonRequest(JsonRequest):
     a custom Validator with specific rules
     """
 
+    _signature_messages = {
+        "signature.signature": "Invalid signature provided.",
+        "signature.download_signature": "Invalid signature provided.",
+    }
+
     def __init__(self, request=None):
         request = request or flask_request
         request = get_request_data(request)
         class_name = self.__class__.__name__
         self._validators = list()
-        action_mapping = RBACValidator.get_action_mapping()
-        if os.getenv("RBAC_SERVER_URL") and class_name in action_mapping.keys():
+        if (
+            os.getenv("RBAC_SERVER_URL")
+            and class_name in RBACValidator.get_action_mapping()
+        ):
             self._validators.append(
                 RBACValidator(request_name=class_name, request=request)
             )
         self._validators.append(
             CustomValidator(
-                rules=self.rules(),
-                messages={
-                    "signature.signature": "Invalid signature provided.",
-                    "signature.download_signature": "Invalid signature provided.",
-                },
-                request=request,
+                rules=self.rules(), messages=self._signature_messages, request=request
             )
         )
 
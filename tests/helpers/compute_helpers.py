@@ -1,6 +1,6 @@
 import itertools
 import json
-import uuid
+import secrets
 
 from ocean_lib.common.agreements.service_agreement import ServiceAgreement
 from ocean_lib.common.agreements.service_types import ServiceTypes
@@ -166,7 +166,7 @@ def comp_ds(
     client, wallet, compute_service_descriptor=None, algos=None, publishers=None
 ):
     metadata = get_sample_ddo_with_compute_service()["service"][0]["attributes"]
-    metadata["main"]["files"][0]["checksum"] = str(uuid.uuid4())
+    metadata["main"]["files"][0]["checksum"] = secrets.token_hex(16)
 
     if compute_service_descriptor == "no_rawalgo":
         service_descriptor = get_compute_service_descriptor_no_rawalgo(
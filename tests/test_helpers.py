@@ -2,13 +2,17 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 
+import copy
 import json
+import logging
 import lzma
 import os
 import pathlib
+import secrets
 import time
-import uuid
+from functools import lru_cache
 from pathlib import Path
+from urllib.parse import urlencode
 
 import artifacts
 import ipfshttpclient
@@ -31,6 +35,42 @@ from ocean_provider.utils.basics import get_datatoken_minter, get_web3, get_conf
 from ocean_provider.utils.encryption import do_encrypt
 from tests.helpers.service_descriptors import get_access_service_descriptor
 
+logger = logging.getLogger(__name__)
+_TESTS_DIR = pathlib.Path(__file__).resolve().parent
+
+
+# the services, contracts and wallet below do not change within a test session
+@lru_cache(maxsize=1)
+def _aquarius():
+    return Aquarius("http://localhost:5000")
+
+
+@lru_cache(maxsize=1)
+def _address_json():
+    address_file = Path(os.getenv("ADDRESS_FILE")).expanduser().resolve()
+    with open(address_file) as f:
+        return json.load(f)["development"]
+
+
+@lru_cache(maxsize=1)
+def _dt_factory():
+    return DTFactory(get_web3(), _address_json()["DTFactory"])
+
+
+@lru_cache(maxsize=1)
+def _metadata_contract():
+    return MetadataContract(get_web3(), _address_json()["Metadata"])
+
+
+@lru_cache(maxsize=1)
+def _provider_wallet():
+    pk = os.environ.get("PROVIDER_PRIVATE_KEY")
+    return Wallet(
+        get_web3(),
+        private_key=pk,
+        block_confirmations=get_config().block_confirmations,
+    )
+
 
 def get_registered_ddo(
     client,
@@ -41,21 +81,13 @@ def get_registered_ddo(
     custom_credentials=None,
 ):
     web3 = get_web3()
-    aqua = Aquarius("http://localhost:5000")
+    aqua = _aquarius()
     ddo_service_endpoint = aqua.get_service_endpoint()
 
     metadata_store_url = json.dumps({"t": 1, "url": ddo_service_endpoint})
     # Create new data token contract
-    address_file = Path(os.getenv("ADDRESS_FILE")).expanduser().resolve()
-    with open(address_file) as f:
-        address_json = json.load(f)
-
-    network = "development"
-    dt_address = address_json[network]["DTFactory"]
-    metadata_address = address_json[network]["Metadata"]
-
-    factory_contract = DTFactory(web3, dt_address)
-    metadata_contract = MetadataContract(web3, metadata_address)
+    factory_contract = _dt_factory()
+    metadata_contract = _metadata_contract()
 
     tx_id = factory_contract.createToken(
         metadata_store_url, "DataToken1", "DT1", to_wei(1000000), wallet
@@ -74,7 +106,6 @@ def get_registered_ddo(
         [ServiceDescriptor.authorization_service_descriptor("http://localhost:12001")]
     )
     service_descriptors.append(service_descriptor)
-    service_type = service_descriptor[0]
 
     service_descriptors = [metadata_service_desc] + service_descriptors
 
@@ -87,11 +118,7 @@ def get_registered_ddo(
     ddo.add_proof(checksums, wallet)
 
     ddo.did = did = f"did:op:{remove_0x_prefix(ddo.data_token_address)}"
-    ddo_service_endpoint.replace("{did}", did)
-    services[0].service_endpoint = ddo_service_endpoint
-
-    stype_to_service = {s.type: s for s in services}
-    _ = stype_to_service[service_type]
+    services[0].service_endpoint = ddo_service_endpoint.replace("{did}", did)
 
     for service in services:
         ddo.add_service(service)
@@ -103,31 +130,26 @@ def get_registered_ddo(
         ddo.credentials = custom_credentials
 
     files_list_str = json.dumps(metadata["main"]["files"])
-    pk = os.environ.get("PROVIDER_PRIVATE_KEY")
-    provider_wallet = Wallet(
-        web3, private_key=pk, block_confirmations=get_config().block_confirmations
-    )
-    encrypted_files = do_encrypt(files_list_str, provider_wallet)
+    encrypted_files = do_encrypt(files_list_str, _provider_wallet())
 
     # only assign if the encryption worked
     if encrypted_files:
-        index = 0
-        for file in metadata["main"]["files"]:
+        for index, file in enumerate(metadata["main"]["files"]):
             file["index"] = index
-            index = index + 1
             del file["url"]
         metadata["encryptedFiles"] = encrypted_files
 
     block = web3.eth.block_number
     try:
-        data = lzma.compress(web3.toBytes(text=ddo.as_text()))
+        # flag 1 tells aquarius the ddo is lzma compressed, the fastest preset will do
+        data = lzma.compress(web3.toBytes(text=ddo.as_text()), preset=1)
         tx_id = metadata_contract.create(ddo.asset_id, bytes([1]), data, wallet)
         if not metadata_contract.verify_tx(tx_id):
             raise AssertionError(
                 f"create DDO on-chain failed, transaction status is 0. Transaction hash is {tx_id}"
             )
-    except Exception as e:
-        print(f"error publishing ddo {ddo.did} in Aquarius: {e}")
+    except Exception:
+        logger.exception(f"error publishing ddo {ddo.did} in Aquarius")
         raise
 
     log = metadata_contract.get_event_log(
@@ -141,28 +163,36 @@ def get_registered_ddo(
     return ddo
 
 
-def get_dataset_ddo_with_access_service(client, wallet):
-    metadata = get_sample_ddo()["service"][0]["attributes"]
-    metadata["main"]["files"][0]["checksum"] = str(uuid.uuid4())
-    service_descriptor = get_access_service_descriptor(wallet.address, metadata)
+def _prep(loader, wallet, n_files=1, diff_provider=False):
+    """
+    Returns the metadata of the sample ddo from `loader`, with fresh file checksums,
+    and the access service descriptor for it.
+    """
+    metadata = loader()["service"][0]["attributes"]
+    for file in metadata["main"]["files"][:n_files]:
+        file["checksum"] = secrets.token_hex(16)
+    service_descriptor = get_access_service_descriptor(
+        wallet.address, metadata, diff_provider=diff_provider
+    )
     metadata["main"].pop("cost")
+
+    return metadata, service_descriptor
+
+
+def get_dataset_ddo_with_access_service(client, wallet):
+    metadata, service_descriptor = _prep(get_sample_ddo, wallet)
     return get_registered_ddo(client, wallet, metadata, service_descriptor)
 
 
 def get_dataset_ddo_with_multiple_files(client, wallet):
-    metadata = get_sample_ddo_with_multiple_files()["service"][0]["attributes"]
-    for i in range(3):
-        metadata["main"]["files"][i]["checksum"] = str(uuid.uuid4())
-    service_descriptor = get_access_service_descriptor(wallet.address, metadata)
-    metadata["main"].pop("cost")
+    metadata, service_descriptor = _prep(
+        get_sample_ddo_with_multiple_files, wallet, n_files=3
+    )
     return get_registered_ddo(client, wallet, metadata, service_descriptor)
 
 
 def get_dataset_ddo_disabled(client, wallet):
-    metadata = get_sample_ddo()["service"][0]["attributes"]
-    metadata["main"]["files"][0]["checksum"] = str(uuid.uuid4())
-    service_descriptor = get_access_service_descriptor(wallet.address, metadata)
-    metadata["main"].pop("cost")
+    metadata, service_descriptor = _prep(get_sample_ddo, wallet)
 
     return get_registered_ddo(
         client, wallet, metadata, service_descriptor, disabled=True
@@ -170,10 +200,7 @@ def get_dataset_ddo_disabled(client, wallet):
 
 
 def get_dataset_ddo_with_denied_consumer(client, wallet, consumer_addr):
-    metadata = get_sample_ddo()["service"][0]["attributes"]
-    metadata["main"]["files"][0]["checksum"] = str(uuid.uuid4())
-    service_descriptor = get_access_service_descriptor(wallet.address, metadata)
-    metadata["main"].pop("cost")
+    metadata, service_descriptor = _prep(get_sample_ddo, wallet)
 
     return get_registered_ddo(
         client,
@@ -185,60 +212,41 @@ def get_dataset_ddo_with_denied_consumer(client, wallet, consumer_addr):
 
 
 def get_sample_algorithm_ddo():
-    path = get_resource_path("ddo", "ddo_sample_algorithm.json")
-    assert path.exists(), f"{path} does not exist!"
-    with open(path, "r") as file_handle:
-        metadata = file_handle.read()
-    return json.loads(metadata)
+    return _get_ddo_fixture("ddo_sample_algorithm.json")
 
 
 def get_sample_ddo_with_compute_service():
     # 'ddo_sa_sample.json')
-    path = get_resource_path("ddo", "ddo_with_compute_service.json")
-    assert path.exists(), f"{path} does not exist!"
-    with open(path, "r") as file_handle:
-        metadata = file_handle.read()
-    return json.loads(metadata)
+    return _get_ddo_fixture("ddo_with_compute_service.json")
 
 
 def get_dataset_with_invalid_url_ddo(client, wallet):
-    metadata = get_invalid_url_ddo()["service"][0]["attributes"]
-    metadata["main"]["files"][0]["checksum"] = str(uuid.uuid4())
-    service_descriptor = get_access_service_descriptor(wallet.address, metadata)
-    metadata["main"].pop("cost")
+    metadata, service_descriptor = _prep(get_invalid_url_ddo, wallet)
     return get_registered_ddo(client, wallet, metadata, service_descriptor)
 
 
 def get_dataset_with_ipfs_url_ddo(client, wallet):
-    metadata = get_ipfs_url_ddo()["service"][0]["attributes"]
-    metadata["main"]["files"][0]["checksum"] = str(uuid.uuid4())
-    service_descriptor = get_access_service_descriptor(wallet.address, metadata)
-    metadata["main"].pop("cost")
+    metadata, service_descriptor = _prep(get_ipfs_url_ddo, wallet)
     return get_registered_ddo(client, wallet, metadata, service_descriptor)
 
 
 def get_algorithm_ddo(client, wallet):
-    metadata = get_sample_algorithm_ddo()["service"][0]["attributes"]
-    metadata["main"]["files"][0]["checksum"] = str(uuid.uuid4())
-    service_descriptor = get_access_service_descriptor(wallet.address, metadata)
-    metadata["main"].pop("cost")
+    metadata, service_descriptor = _prep(get_sample_algorithm_ddo, wallet)
     return get_registered_ddo(client, wallet, metadata, service_descriptor)
 
 
 def get_algorithm_ddo_different_provider(client, wallet):
-    metadata = get_sample_algorithm_ddo()["service"][0]["attributes"]
-    metadata["main"]["files"][0]["checksum"] = str(uuid.uuid4())
-    service_descriptor = get_access_service_descriptor(
-        wallet.address, metadata, diff_provider=True
+    metadata, service_descriptor = _prep(
+        get_sample_algorithm_ddo, wallet, diff_provider=True
     )
-    metadata["main"].pop("cost")
     return get_registered_ddo(client, wallet, metadata, service_descriptor)
 
 
 def get_nonce(client, address):
     endpoint = BaseURLs.ASSETS_URL + "/nonce"
     response = client.get(
-        endpoint + "?" + f"&userAddress={address}", content_type="application/json"
+        f"{endpoint}?{urlencode({'userAddress': address})}",
+        content_type="application/json",
     )
     assert (
         response.status_code == 200 and response.data
@@ -253,7 +261,6 @@ def mint_tokens_and_wait(data_token_contract, receiver_wallet, minter_wallet):
     dtc = data_token_contract
     tx_id = dtc.mint(receiver_wallet.address, to_wei(50), minter_wallet)
     dtc.get_tx_receipt(web3, tx_id)
-    time.sleep(2)
 
     def verify_supply(mint_amount=to_wei(50)):
         supply = dtc.totalSupply()
@@ -263,7 +270,7 @@ def mint_tokens_and_wait(data_token_contract, receiver_wallet, minter_wallet):
             supply = dtc.totalSupply()
         return supply
 
-    while True:
+    for _ in range(50):
         try:
             s = verify_supply()
             if s > 0:
@@ -271,55 +278,61 @@ def mint_tokens_and_wait(data_token_contract, receiver_wallet, minter_wallet):
         except (ValueError, Exception):
             pass
 
+        time.sleep(0.1)
+    else:
+        raise AssertionError(f"Minting tokens of {dtc.address} failed.")
+
 
 def get_resource_path(dir_name, file_name):
-    base = os.path.realpath(__file__).split(os.path.sep)[1:-1]
     if dir_name:
-        return pathlib.Path(os.path.join(os.path.sep, *base, dir_name, file_name))
+        return _TESTS_DIR / dir_name / file_name
     else:
-        return pathlib.Path(os.path.join(os.path.sep, *base, file_name))
+        return _TESTS_DIR / file_name
 
 
-def get_sample_ddo():
-    path = get_resource_path("ddo", "ddo_sa_sample.json")
+def _get_ddo_fixture(file_name):
+    """Returns a fresh copy of the ddo fixture, callers are free to mutate it."""
+    return copy.deepcopy(_load_fixture(str(get_resource_path("ddo", file_name))))
+
+
+@lru_cache(maxsize=None)
+def _load_fixture(path_str):
+    path = pathlib.Path(path_str)
     assert path.exists(), f"{path} does not exist!"
     with open(path, "r") as file_handle:
-        metadata = file_handle.read()
-    return json.loads(metadata)
+        return json.load(file_handle)
+
+
+def get_sample_ddo():
+    return _get_ddo_fixture("ddo_sa_sample.json")
 
 
 def get_sample_ddo_with_multiple_files():
-    path = get_resource_path("ddo", "ddo_sa_sample_multiple_files.json")
-    assert path.exists(), f"{path} does not exist!"
-    with open(path, "r") as file_handle:
-        metadata = file_handle.read()
-    return json.loads(metadata)
+    return _get_ddo_fixture("ddo_sa_sample_multiple_files.json")
 
 
 def get_invalid_url_ddo():
-    path = get_resource_path("ddo", "ddo_sample_invalid_url.json")
-    assert path.exists(), f"{path} does not exist!"
-    with open(path, "r") as file_handle:
-        metadata = file_handle.read()
-    return json.loads(metadata)
+    return _get_ddo_fixture("ddo_sample_invalid_url.json")
 
 
 def get_ipfs_url_ddo():
-    path = get_resource_path("ddo", "ddo_sample_ipfs_url.json")
-    assert path.exists(), f"{path} does not exist!"
-    with open(path, "r") as file_handle:
-        metadata = file_handle.read()
-    client = ipfshttpclient.connect("/dns/172.15.0.16/tcp/5001/http")
-    cid = client.add("./tests/resources/ddo_sample_file.txt")["Hash"]
-    url = f"ipfs://{cid}"
-    metadata_json = json.loads(metadata)
+    metadata_json = _get_ddo_fixture("ddo_sample_ipfs_url.json")
+    url = f"ipfs://{_ipfs_cid()}"
     metadata_json["service"][0]["attributes"]["main"]["files"][0]["url"] = url
     return metadata_json
 
 
+@lru_cache(maxsize=1)
+def _ipfs_cid():
+    """Adds the static sample file to ipfs once per session, returns its cid."""
+    client = ipfshttpclient.connect("/dns/172.15.0.16/tcp/5001/http")
+    return client.add("./tests/resources/ddo_sample_file.txt")["Hash"]
+
+
 def wait_for_ddo(ddo_store, did, timeout=30):
     start = time.time()
     ddo = None
+    delay = 0.05
     while not ddo:
         try:
             ddo = ddo_store.get_asset_ddo(did)
@@ -327,7 +340,8 @@ def wait_for_ddo(ddo_store, did, timeout=30):
             pass
 
         if not ddo:
-            time.sleep(0.2)
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
 
         if time.time() - start > timeout:
             break
@@ -348,9 +362,7 @@ def send_order(client, ddo, datatoken, service, cons_wallet, expect_failure=Fals
         }
     )
 
-    request_url = (
-        init_endpoint + "?" + "&".join([f"{k}={v}" for k, v in payload.items()])
-    )
+    request_url = f"{init_endpoint}?{urlencode(payload)}"
 
     response = client.get(request_url)
 